@@ -1,21 +1,16 @@
 #!/usr/bin/env python3
-import datetime
-import glob
+import concurrent.futures
+import functools
+import io
 import json
 import os
-import smtplib
-import subprocess
+import queue
 import sys
-import tempfile
+import threading
+import time
 import tkinter as tk
-import traceback
-from email.mime.text import MIMEText
 from tkinter import font, messagebox
 
-import PIL.ImageTk as ImageTk
-import qrcode
-from PIL import Image
-
 # SETTINGS FILE
 SETTINGS_FILE = "user_settings.json"
 
@@ -23,6 +18,23 @@ SETTINGS_FILE = "user_settings.json"
 # Path for saving files
 WRITING_DIR = "text_files"
 os.makedirs(WRITING_DIR, exist_ok=True)
+_WRITING_PREFIX = os.path.join(WRITING_DIR, "")
+
+# Ctrl+S writes this many milliseconds after the last press
+SAVE_DELAY_MS = 200
+
+# The browser Listbox is filled a page at a time
+LISTBOX_PAGE = 200
+
+# How often the Tk thread checks for worker results while any are outstanding
+RESULT_POLL_MS = 20
+
+# Cached SMTP connections are reused for sends less than this many seconds apart
+SMTP_IDLE_TIMEOUT = 60
+# Socket timeout in seconds, so a silently dropped connection can't hang a send
+SMTP_TIMEOUT = 30
+# Longest the window close waits to get at, and QUIT, the cached connection
+SMTP_CLOSE_TIMEOUT = 2
 
 # Dark theme colors
 THEME = {
@@ -36,343 +48,643 @@ THEME = {
 
 # Default filename
 DEFAULT_FILENAME = "%Y%m%d_%H%M%S.txt"
+_filename_cache = {"second": None, "name": ""}
 
 # Help text
-HELP_TEXT = "Ctrl+T: Toggle Help\n" "Ctrl+S: Save\n" "Ctrl+N: New File\n" "Ctrl+F: File Browser\n" "Ctrl+M: Email Current Text\n" "Ctrl+Q: Show QR-Code of Current Text"
+HELP_TEXT = """\
+Ctrl+T: Toggle Help
+Ctrl+S: Save
+Ctrl+N: New File
+Ctrl+F: File Browser
+Ctrl+M: Email Current Text
+Ctrl+Q: Show QR-Code of Current Text"""
+
+
+def default_filename():
+    """Return a new timestamped filename in the DEFAULT_FILENAME format"""
+    # The name only changes once a second; reuse it for calls within the same second
+    now = int(time.time())
+    if now != _filename_cache["second"]:
+        _filename_cache["second"] = now
+        _filename_cache["name"] = time.strftime(DEFAULT_FILENAME, time.localtime(now))
+    return _filename_cache["name"]
+
+
+def _write_file(full_path, content):
+    """Write content to full_path atomically"""
+    # Write to a temp file and rename it over the target, so a crash
+    # mid-write never leaves a truncated file behind
+    tmp_path = full_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content.encode("utf-8"))
+    os.replace(tmp_path, full_path)
+
+
+def _read_file(full_path):
+    """Return the text of full_path"""
+    # One read and one decode of the whole file instead of text-mode chunking
+    with open(full_path, "rb") as f:
+        # Strict, so a non-UTF-8 file fails to load instead of being saved back with U+FFFD
+        content = f.read().decode("utf-8")
+    # Binary mode skips universal newlines; Tk would show stray carriage returns
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+@functools.lru_cache(maxsize=None)
+def _qr_modules():
+    """Import the QR code dependencies on first use and keep them for later calls"""
+    import PIL.ImageTk as ImageTk
+    import qrcode
+    from PIL import Image
+
+    return qrcode, Image, ImageTk
+
+
+@functools.lru_cache(maxsize=8)
+def _read_json(path, mtime):
+    """Parse a JSON file; the mtime argument makes edits miss the cache"""
+    with open(path, "rb") as f:
+        return json.loads(f.read())
 
 
-def apply_theme_to_widget(widget):
-    """Apply dark theme to a widget and its children"""
-    cls = widget.winfo_class()
+def load_email_settings():
+    default_settings = {"smtp_server": "", "smtp_port": 587, "sender_email": "", "sender_password": "", "recipient_email": ""}
 
-    try:
-        if cls in ("Frame", "TFrame", "LabelFrame", "Labelframe"):
-            widget.configure(bg=THEME["window_bg"])
-        elif cls in ("Label", "Button"):
-            widget.configure(bg=THEME["window_bg"], fg=THEME["text_fg"])
-        elif cls in ("Text", "Entry"):
-            widget.configure(bg=THEME["text_bg"], fg=THEME["text_fg"], insertbackground=THEME["text_fg"], selectbackground=THEME["select_bg"], selectforeground=THEME["select_fg"])
-        elif cls == "Listbox":
-            widget.configure(bg=THEME["text_bg"], fg=THEME["text_fg"])
-        elif cls == "Scrollbar":
-            # Make sure scrollbars match the theme
-            widget.configure(bg=THEME["window_bg"], troughcolor=THEME["text_bg"])
-    except Exception:
-        pass
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            # Copy, so merging defaults below doesn't mutate the cached dict
+            settings = dict(_read_json(SETTINGS_FILE, os.stat(SETTINGS_FILE).st_mtime_ns))
 
-    # Apply to all children widgets recursively
-    for child in widget.winfo_children():
-        apply_theme_to_widget(child)
+            # Merge default settings with loaded settings
+            for key in default_settings:
+                if key not in settings:
+                    settings[key] = default_settings[key]
 
+            return settings
+        except Exception as e:
+            print(f"Error loading email settings: {e}")
+            # Create a default settings file if loading fails
+            try:
+                with open(SETTINGS_FILE, "w") as f:
+                    json.dump(default_settings, f, indent=4)
+                print("Default email settings file created.")
+            except Exception as create_err:
+                print(f"Error creating default settings file: {create_err}")
+            return default_settings
+    else:
+        # Create default settings file if it doesn't exist
+        try:
+            with open(SETTINGS_FILE, "w") as f:
+                json.dump(default_settings, f, indent=4)
+            print("Default email settings file created.")
+        except Exception as create_err:
+            print(f"Error creating default settings file: {create_err}")
+        return default_settings
 
-def save_file(event=None):
-    """Save current text to file"""
-    content = text_widget.get("1.0", tk.END).strip()
-    filename = filename_var.get()
 
-    if not filename:
-        filename = datetime.datetime.now().strftime(DEFAULT_FILENAME)
-        filename_var.set(filename)
+# Load email settings
+email_settings = load_email_settings()
 
-    full_path = os.path.join(WRITING_DIR, filename)
+# Use loaded settings
+SMTP_SERVER = email_settings.get("smtp_server", "")
+SMTP_PORT = email_settings.get("smtp_port", 587)
+SENDER_EMAIL = email_settings.get("sender_email", "")
+SENDER_PASSWORD = email_settings.get("sender_password", "")
+RECIPIENT_EMAIL = email_settings.get("recipient_email", "")
 
-    try:
-        with open(full_path, "w") as f:
-            f.write(content)
-    except Exception as e:
-        messagebox.showerror("Error", f"Error saving file: {e}")
 
-    text_widget.focus_set()
-    return "break"
+class App:
+    """The writer window, its widgets and key handlers"""
+
+    __slots__ = (
+        "root",
+        "filename_var",
+        "text_widget",
+        "scrollbar",
+        "help_frame",
+        "browser_frame",
+        "file_listbox",
+        "browser_scrollbar",
+        "photo_image",
+        "_font_cache",
+        "_save_job",
+        "_last_saved",
+        "_saved_stat",
+        "_save_failed",
+        "_file_cache",
+        "_listed_count",
+        "_browser_open",
+        "_help_open",
+        "_io_executor",
+        "_results",
+        "_outstanding",
+        "_poll_job",
+        "_smtp_conn",
+        "_smtp_last",
+        "_smtp_lock",
+    )
+
+    def __init__(self):
+        # Shared Tk font objects, keyed by (size, weight)
+        self._font_cache = {}
+        # Pending delayed save, the (path, content hash) last submitted, and the
+        # (size, mtime) that write left on disk, or None while it is still queued
+        self._save_job = None
+        self._last_saved = None
+        self._saved_stat = None
+        # Whether that last submitted save failed; closing the window is refused then
+        self._save_failed = False
+        # Sorted file browser listing, keyed by the directory mtime
+        self._file_cache = {"mtime": None, "names": []}
+        # Rows of the cached listing currently in the browser Listbox
+        self._listed_count = 0
+        # Whether the file browser and the help panel are currently shown
+        self._browser_open = False
+        self._help_open = False
+        # Single worker, so saves and loads reach the disk in the order they were issued
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Callbacks posted by worker threads, run on the Tk thread by _drain_results.
+        # The poll only runs while _outstanding results are still due.
+        self._results = queue.Queue()
+        self._outstanding = 0
+        self._poll_job = None
+        # Cached SMTP connection and when it was last used
+        self._smtp_conn = None
+        self._smtp_last = 0.0
+        self._smtp_lock = threading.Lock()
+        # Keep a reference to the QR image to prevent garbage collection
+        self.photo_image = None
+
+        # MAIN WINDOW SETUP
+        self.root = root = tk.Tk()
+        root.title("Focused Writer")
+        root.geometry("800x600")
+
+        # Theme defaults go into the option database before any widget exists, so Tk
+        # applies them as each widget is created instead of reconfiguring afterwards
+        root.tk_setPalette(background=THEME["window_bg"], foreground=THEME["text_fg"])
+        for cls in ("Text", "Entry"):
+            root.option_add(f"*{cls}.background", THEME["text_bg"])
+            root.option_add(f"*{cls}.insertBackground", THEME["text_fg"])
+            root.option_add(f"*{cls}.selectBackground", THEME["select_bg"])
+            root.option_add(f"*{cls}.selectForeground", THEME["select_fg"])
+        root.option_add("*Listbox.background", THEME["text_bg"])
+        root.option_add("*Scrollbar.troughColor", THEME["text_bg"])
+
+        # Make main window expandable
+        root.grid_rowconfigure(1, weight=1)
+        root.grid_columnconfigure(0, weight=1)
+
+        # File name tracking
+        self.filename_var = tk.StringVar()
+        self.filename_var.set(default_filename())
+
+        # Top bar with filename
+        header_frame = tk.Frame(root)
+        header_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+
+        file_label = tk.Label(header_frame, text="File:", font=self.get_font(12))
+        file_label.pack(side="left", padx=5)
+
+        filename_label = tk.Label(header_frame, textvariable=self.filename_var, font=self.get_font(12))
+        filename_label.pack(side="left", fill="x", expand=True, padx=5)
+
+        help_hint = tk.Label(header_frame, text="Ctrl+T for help", font=self.get_font(10))
+        help_hint.pack(side="right", padx=5)
+
+        # Main text area
+        text_frame = tk.Frame(root)
+        text_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        text_frame.grid_rowconfigure(0, weight=1)
+        text_frame.grid_columnconfigure(0, weight=1)
+
+        self.text_widget = tk.Text(text_frame, wrap="word", font=self.get_font(12))
+        self.text_widget.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = tk.Scrollbar(text_frame, command=self.text_widget.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.text_widget.config(yscrollcommand=self.scrollbar.set)
+
+        # Help panel
+        self.help_frame = tk.Frame(root)
+        self.help_frame.grid(row=2, column=0, sticky="ew", padx=5, pady=5)
+        help_label = tk.Label(self.help_frame, text=HELP_TEXT, font=self.get_font(12), justify="left")
+        help_label.pack(padx=10, pady=10)
+        self.help_frame.grid_remove()  # Initially hidden
+
+        # File browser (initially hidden)
+        self.browser_frame = tk.Frame(root)
+        self.file_listbox = tk.Listbox(self.browser_frame, font=self.get_font(10))
+        self.file_listbox.pack(side="left", fill="both", expand=True)
+
+        self.browser_scrollbar = tk.Scrollbar(self.browser_frame, orient="vertical", command=self.file_listbox.yview)
+        self.browser_scrollbar.pack(side="right", fill="y")
+        self.file_listbox.config(yscrollcommand=self.on_file_list_scroll)
+        # Scan while the window is still coming up, so the first Ctrl+F is already cached
+        root.after(100, self.populate_file_list)
+
+        root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # KEY BINDINGS
+        root.bind("<Control-s>", self.save_file)
+        root.bind("<Control-n>", self.new_file)
+        root.bind("<Control-f>", self.toggle_file_browser)
+        root.bind("<Control-t>", self.toggle_help_panel)
+        root.bind("<Control-m>", self.email_text)
+        root.bind("<Control-q>", self.show_qr_code)
+        self.file_listbox.bind("<Return>", self.load_selected_file)
+
+        # Start the app with focus on text
+        self.text_widget.focus_set()
+
+    def run(self):
+        """Run the Tk main loop"""
+        self.root.mainloop()
+
+    def _expect_result(self):
+        """Note that a worker will post one result, and make sure the poll is running"""
+        self._outstanding += 1
+        if self._poll_job is None:
+            self._poll_job = self.root.after(RESULT_POLL_MS, self._drain_results)
+
+    def _post(self, func, *args):
+        """Queue func(*args) to run on the Tk thread; safe to call from any thread"""
+        self._results.put((func, args))
+
+    def _drain_results(self):
+        """Run callbacks posted by worker threads, polling again while more are due"""
+        posted = []
+        while True:
+            try:
+                posted.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+        self._outstanding -= len(posted)
 
+        # Re-arm before running anything, so a callback that raises or opens a
+        # modal dialog can't stop later results from being picked up
+        self._poll_job = self.root.after(RESULT_POLL_MS, self._drain_results) if self._outstanding else None
 
-def new_file(event=None):
-    """Create a new file"""
-    text_widget.delete("1.0", tk.END)
-    new_filename = datetime.datetime.now().strftime(DEFAULT_FILENAME)
-    filename_var.set(new_filename)
+        for func, args in posted:
+            try:
+                func(*args)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+
+    def get_font(self, size, weight="normal"):
+        """Return the shared Courier New font for the given size and weight"""
+        key = (size, weight)
+        f = self._font_cache.get(key)
+        if f is None:
+            f = self._font_cache[key] = font.Font(family="Courier New", size=size, weight=weight)
+        return f
+
+    def save_file(self, event=None):
+        """Save current text to file"""
+        # Held or repeated Ctrl+S collapses into one save after the last press
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+        self._save_job = self.root.after(SAVE_DELAY_MS, self._do_save)
+
+        self.text_widget.focus_set()
+        return "break"
 
-    text_widget.focus_set()
-    return "break"
+    def _flush_save(self):
+        """Run a pending delayed save now, before the buffer or filename changes"""
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+            self._do_save()
+
+    def _do_save(self):
+        """Write the current text unless the file already holds it"""
+        self._save_job = None
+
+        # "end-1c" skips the trailing newline Tk always appends
+        content = self.text_widget.get("1.0", "end-1c")
+        filename = self.filename_var.get()
+
+        if not filename:
+            filename = default_filename()
+            self.filename_var.set(filename)
+
+        full_path = _WRITING_PREFIX + filename
+        saved = (full_path, hash(content))
+        if saved == self._last_saved and self._unchanged_on_disk(full_path):
+            return
+
+        # Recorded at submit time: the single worker writes in order, so this is
+        # what the file will hold once the queue drains
+        self._last_saved = saved
+        self._saved_stat = None
+        self._save_failed = False
+        # Disk I/O runs on the worker; the result is posted back to the Tk thread
+        self._expect_result()
+        future = self._io_executor.submit(_write_file, full_path, content)
+        future.add_done_callback(lambda f: self._post(self._on_save_done, f, saved))
+
+    def _unchanged_on_disk(self, full_path):
+        """Whether full_path still holds what the last save wrote"""
+        if self._saved_stat is None:
+            # That write is still queued and will land in order
+            return True
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == self._saved_stat
+
+    def _on_save_done(self, future, saved):
+        """Report the outcome of a background save"""
+        e = future.exception()
+        if e is not None:
+            if saved == self._last_saved:
+                self._last_saved = None
+                self._save_failed = True
+            messagebox.showerror("Error", f"Error saving file: {e}")
+            return
+
+        if saved == self._last_saved:
+            try:
+                st = os.stat(saved[0])
+                self._saved_stat = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                self._last_saved = None
+        # Saving moves the file to the top of the list; don't rely on the
+        # directory mtime having ticked over since the last scan
+        self._file_cache["mtime"] = None
+
+    def _on_close(self):
+        """Close the window once every save has reached the disk"""
+        # Queue a pending delayed save behind whatever is already on the worker
+        self._flush_save()
+
+        # Let outstanding reads and writes finish. Workers only post to the results
+        # queue and never call into Tk, so joining here can't deadlock.
+        self._io_executor.shutdown(wait=True)
+        # Handle their results now, so a failed save shows its error
+        if self._poll_job is not None:
+            self.root.after_cancel(self._poll_job)
+        self._drain_results()
+
+        if self._save_failed:
+            # The text only exists in the window; keep it open like a failed Ctrl+S did
+            self._io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            return
+
+        self._shutdown_smtp()
+        self.root.destroy()
+
+    def new_file(self, event=None):
+        """Create a new file"""
+        self._flush_save()
+        self.text_widget.delete("1.0", tk.END)
+        new_filename = default_filename()
+        self.filename_var.set(new_filename)
+
+        self.text_widget.focus_set()
+        return "break"
 
+    def populate_file_list(self):
+        """Fill the file browser with existing files"""
+        cache = self._file_cache
+
+        # Creating, deleting or renaming a file bumps the directory mtime, so the
+        # sorted listing only has to be rebuilt when that changes
+        dir_mtime = os.stat(WRITING_DIR).st_mtime_ns
+        if dir_mtime == cache["mtime"] and self._listed_count:
+            # The Listbox still shows this listing from the last open
+            return
+
+        if dir_mtime != cache["mtime"]:
+            with os.scandir(WRITING_DIR) as it:
+                entries = [(e.name, e.stat().st_mtime_ns) for e in it if e.name.endswith(".txt") and e.is_file()]
+            entries.sort(key=lambda t: t[1], reverse=True)
+            cache["mtime"] = dir_mtime
+            cache["names"] = [name for name, _ in entries]
+
+        # Only the first page goes into the Listbox; the rest is appended on scroll
+        self.file_listbox.delete(0, tk.END)
+        page = cache["names"][:LISTBOX_PAGE]
+        if page:
+            self.file_listbox.insert(tk.END, *page)
+        self._listed_count = len(page)
+
+    def on_file_list_scroll(self, first, last):
+        """Update the browser scrollbar and append the next page near the bottom"""
+        self.browser_scrollbar.set(first, last)
+
+        names = self._file_cache["names"]
+        listed = self._listed_count
+        if listed < len(names) and float(last) * listed > listed - LISTBOX_PAGE // 4:
+            page = names[listed : listed + LISTBOX_PAGE]
+            self.file_listbox.insert(tk.END, *page)
+            self._listed_count = listed + len(page)
+
+    def toggle_file_browser(self, event=None):
+        """Show/hide the file browser"""
+        if not self._browser_open:
+            self.populate_file_list()
+            self.browser_frame.place(relx=0.75, y=25, anchor="ne", width=250, height=200)
+            self.file_listbox.focus_set()
+        else:
+            self.browser_frame.place_forget()
+        self._browser_open = not self._browser_open
 
-def populate_file_list():
-    """Fill the file browser with existing files"""
-    file_listbox.delete(0, tk.END)
-    files = glob.glob(os.path.join(WRITING_DIR, "*.txt"))
-    files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+        return "break"
 
-    for f in files:
-        file_listbox.insert(tk.END, os.path.basename(f))
+    def close_file_browser(self):
+        """Hide the file browser"""
+        self.browser_frame.place_forget()
+        self._browser_open = False
 
+    def load_selected_file(self, event=None):
+        """Load the selected file from the browser"""
+        selection = self.file_listbox.curselection()
+        if not selection:
+            return "break"
 
-def toggle_file_browser(event=None):
-    """Show/hide the file browser"""
-    if not browser_frame.winfo_ismapped():
-        populate_file_list()
-        browser_frame.place(relx=0.75, y=25, anchor="ne", width=250, height=200)
-        file_listbox.focus_set()
-    else:
-        browser_frame.place_forget()
+        selected_file = self.file_listbox.get(selection[0])
+        full_path = _WRITING_PREFIX + selected_file
 
-    return "break"
+        if not os.path.exists(full_path):
+            return "break"
 
+        self._expect_result()
+        future = self._io_executor.submit(_read_file, full_path)
+        future.add_done_callback(lambda f: self._post(self._on_load_done, f, selected_file))
 
-def load_selected_file(event=None):
-    """Load the selected file from the browser"""
-    selection = file_listbox.curselection()
-    if not selection:
         return "break"
 
-    selected_file = file_listbox.get(selection[0])
-    full_path = os.path.join(WRITING_DIR, selected_file)
-
-    if not os.path.exists(full_path):
+    def _on_load_done(self, future, selected_file):
+        """Show a file read in the background"""
+        e = future.exception()
+        if e is None:
+            self._flush_save()
+            self.text_widget.replace("1.0", tk.END, future.result())
+            self.filename_var.set(selected_file)
+
+            self.close_file_browser()
+        elif isinstance(e, UnicodeDecodeError):
+            messagebox.showerror("Error", f"{selected_file} is not UTF-8 text and was not loaded: {e}")
+
+        self.text_widget.focus_set()
+
+    def toggle_help_panel(self, event=None):
+        """Show or hide the help panel"""
+        if self._help_open:
+            self.help_frame.grid_remove()
+        else:
+            self.help_frame.grid()
+        self._help_open = not self._help_open
+
+        self.text_widget.focus_set()
         return "break"
 
-    try:
-        with open(full_path, "r") as f:
-            content = f.read()
+    def email_text(self, event=None):
+        """Email the current text"""
+        from email.mime.text import MIMEText
 
-        text_widget.delete("1.0", tk.END)
-        text_widget.insert("1.0", content)
-        filename_var.set(selected_file)
+        content = self.text_widget.get("1.0", "end-1c")
+        filename = self.filename_var.get()
 
-        browser_frame.place_forget()
-    except Exception:
-        pass
+        if not all([SMTP_SERVER, SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL]):
+            messagebox.showwarning("Email Setup", "Configure SMTP settings at the top of the script.")
+            return "break"
 
-    text_widget.focus_set()
-    return "break"
+        msg = MIMEText(content)
+        msg["Subject"] = filename
+        msg["From"] = SENDER_EMAIL
+        msg["To"] = RECIPIENT_EMAIL
 
+        # Send from a worker thread so the editor stays usable during the SMTP handshake
+        self._expect_result()
+        threading.Thread(target=self._send_email, args=(msg,), daemon=True).start()
 
-def toggle_help_panel(event=None):
-    """Show or hide the help panel"""
-    if help_frame.winfo_ismapped():
-        help_frame.grid_remove()
-    else:
-        help_frame.grid()
-
-    text_widget.focus_set()
-    return "break"
+        self.text_widget.focus_set()
+        return "break"
 
+    def _send_email(self, msg):
+        """Send a prepared message and report the result on the Tk thread"""
+        with self._smtp_lock:
+            try:
+                server = self._get_smtp()
+                server.send_message(msg)
+                self._smtp_last = time.monotonic()
+            except Exception as e:
+                self._close_smtp()
+                self._post(messagebox.showerror, "Error", f"Failed to send email: {e}")
+                return
 
-def email_text(event=None):
-    """Email the current text"""
-    content = text_widget.get("1.0", tk.END).strip()
-    filename = filename_var.get()
+        self._post(messagebox.showinfo, "Email", "Email Sent")
 
-    if not all([SMTP_SERVER, SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL]):
-        messagebox.showwarning("Email Setup", "Configure SMTP settings at the top of the script.")
-        return "break"
+    def _get_smtp(self):
+        """Return a logged-in SMTP connection, reusing the previous one if it is still alive"""
+        import smtplib
 
-    msg = MIMEText(content)
-    msg["Subject"] = f"{filename}"
-    msg["From"] = SENDER_EMAIL
-    msg["To"] = RECIPIENT_EMAIL
+        if self._smtp_conn is not None and time.monotonic() - self._smtp_last < SMTP_IDLE_TIMEOUT:
+            try:
+                self._smtp_conn.noop()
+                return self._smtp_conn
+            except (smtplib.SMTPException, OSError):
+                pass
 
-    try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+        self._close_smtp()
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
             server.starttls()
             server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.send_message(msg)
-        messagebox.showinfo("Email", "Email Sent")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to send email: {e}")
-
-    text_widget.focus_set()
-    return "break"
-
-
-def show_qr_code(event=None):
-    """Create and display QR Code to copy text"""
-    content = text_widget.get("1.0", tk.END).strip()
-
-    if not content:
-        messagebox.showwarning("QR Code", "No text to encode")
-        return "break"
-
-    try:
-        # Create QR code
-        qr_img = qrcode.make(content)
-
-        # Create a temporary file for the image
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        temp_filename = temp_file.name
-        temp_file.close()
-
-        # Save QR code image to temp file
-        qr_img.save(temp_filename)
-
-        # Display the QR code in a new window
-        qr_window = tk.Toplevel(root)
-        qr_window.title("Text QR Code")
-        qr_window.configure(bg=THEME["window_bg"])
-
-        # Open and display the image using PIL
-        img = Image.open(temp_filename)
-        # Use a global variable to prevent garbage collection
-        global photo_image
-        photo_image = ImageTk.PhotoImage(img)
-
-        # Create a label to display the image
-        img_label = tk.Label(qr_window, image=photo_image, bg=THEME["window_bg"])
-        img_label.pack(padx=20, pady=20)
-
-        # Add a note
-        note_label = tk.Label(qr_window, text="Scan this QR code to copy the text", font=("Courier New", 12), bg=THEME["window_bg"], fg=THEME["text_fg"])
-        note_label.pack(padx=10, pady=10)
-
-        # Add a close button
-        close_button = tk.Button(qr_window, text="Close", command=qr_window.destroy, bg=THEME["window_bg"], fg=THEME["text_fg"])
-        close_button.pack(pady=10)
-
-        # Center the window on screen
-        qr_window.update_idletasks()
-        width = qr_window.winfo_width()
-        height = qr_window.winfo_height()
-        x = (qr_window.winfo_screenwidth() // 2) - (width // 2)
-        y = (qr_window.winfo_screenheight() // 2) - (height // 2)
-        qr_window.geometry(f"{width}x{height}+{x}+{y}")
-
-        # Configure the window to be modal
-        qr_window.transient(root)
-        qr_window.grab_set()
-
-        # Clean up the temp file when the window is closed
-        def on_close():
+        except Exception:
+            server.close()
+            raise
+        self._smtp_conn = server
+        return server
+
+    def _shutdown_smtp(self):
+        """Close the cached SMTP connection when the window closes"""
+        # A send still holding the lock owns the socket; its daemon thread ends with the process
+        if not self._smtp_lock.acquire(timeout=SMTP_CLOSE_TIMEOUT):
+            return
+        try:
+            if self._smtp_conn is not None and self._smtp_conn.sock is not None:
+                self._smtp_conn.sock.settimeout(SMTP_CLOSE_TIMEOUT)
+            self._close_smtp()
+        finally:
+            self._smtp_lock.release()
+
+    def _close_smtp(self):
+        """Drop the cached SMTP connection; the caller holds _smtp_lock"""
+        if self._smtp_conn is not None:
             try:
-                os.unlink(temp_filename)
-            except:
+                self._smtp_conn.quit()
+            except Exception:
                 pass
-            qr_window.destroy()
-
-        qr_window.protocol("WM_DELETE_WINDOW", on_close)
-        close_button.config(command=on_close)
+            self._smtp_conn = None
 
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to create QR code: {e}")
-        traceback.print_exc()
+    def show_qr_code(self, event=None):
+        """Create and display QR Code to copy text"""
+        content = self.text_widget.get("1.0", "end-1c")
 
-    text_widget.focus_set()
-    return "break"
+        # isspace() checks for blank text without building a stripped copy
+        if not content or content.isspace():
+            messagebox.showwarning("QR Code", "No text to encode")
+            return "break"
 
-
-def load_email_settings():
-    default_settings = {"smtp_server": "", "smtp_port": 587, "sender_email": "", "sender_password": "", "recipient_email": ""}
-
-    if os.path.exists(SETTINGS_FILE):
         try:
-            with open(SETTINGS_FILE, "r") as f:
-                settings = json.load(f)
+            qrcode, Image, ImageTk = _qr_modules()
+
+            # Create QR code; box_size 4 keeps long texts within a 1024x600 screen
+            qr = qrcode.QRCode(box_size=4)
+            # Encode the stripped text, as before; QR payloads are small, so the copy is cheap
+            qr.add_data(content.strip())
+            qr_img = qr.make_image()
+
+            # Encode the image in memory rather than through a temp file
+            buf = io.BytesIO()
+            qr_img.save(buf, format="PNG")
+            buf.seek(0)
+
+            # Display the QR code in a new window
+            qr_window = tk.Toplevel(self.root)
+            qr_window.title("Text QR Code")
+
+            # Open and display the image using PIL
+            img = Image.open(buf)
+            # Keep a reference on the app to prevent garbage collection
+            self.photo_image = ImageTk.PhotoImage(img)
+
+            # Create a label to display the image
+            img_label = tk.Label(qr_window, image=self.photo_image)
+            img_label.pack(padx=20, pady=20)
+
+            # Add a note
+            note_label = tk.Label(qr_window, text="Scan this QR code to copy the text", font=self.get_font(12))
+            note_label.pack(padx=10, pady=10)
+
+            # Add a close button
+            close_button = tk.Button(qr_window, text="Close", command=qr_window.destroy)
+            close_button.pack(pady=10)
+
+            # Center the window on screen
+            qr_window.update_idletasks()
+            width = qr_window.winfo_width()
+            height = qr_window.winfo_height()
+            x = (qr_window.winfo_screenwidth() // 2) - (width // 2)
+            y = (qr_window.winfo_screenheight() // 2) - (height // 2)
+            qr_window.geometry(f"{width}x{height}+{x}+{y}")
+
+            # Configure the window to be modal
+            qr_window.transient(self.root)
+            qr_window.grab_set()
 
-            # Merge default settings with loaded settings
-            for key in default_settings:
-                if key not in settings:
-                    settings[key] = default_settings[key]
-
-            return settings
         except Exception as e:
-            print(f"Error loading email settings: {e}")
-            # Create a default settings file if loading fails
-            try:
-                with open(SETTINGS_FILE, "w") as f:
-                    json.dump(default_settings, f, indent=4)
-                print("Default email settings file created.")
-            except Exception as create_err:
-                print(f"Error creating default settings file: {create_err}")
-            return default_settings
-    else:
-        # Create default settings file if it doesn't exist
-        try:
-            with open(SETTINGS_FILE, "w") as f:
-                json.dump(default_settings, f, indent=4)
-            print("Default email settings file created.")
-        except Exception as create_err:
-            print(f"Error creating default settings file: {create_err}")
-        return default_settings
+            import traceback
 
+            messagebox.showerror("Error", f"Failed to create QR code: {e}")
+            traceback.print_exc()
 
-# Load email settings
-email_settings = load_email_settings()
-
-# Use loaded settings
-SMTP_SERVER = email_settings.get("smtp_server", "")
-SMTP_PORT = email_settings.get("smtp_port", 587)
-SENDER_EMAIL = email_settings.get("sender_email", "")
-SENDER_PASSWORD = email_settings.get("sender_password", "")
-RECIPIENT_EMAIL = email_settings.get("recipient_email", "")
+        self.text_widget.focus_set()
+        return "break"
 
-# MAIN WINDOW SETUP
-root = tk.Tk()
-root.title("Focused Writer")
-root.geometry("800x600")
-
-# Make main window expandable
-root.grid_rowconfigure(1, weight=1)
-root.grid_columnconfigure(0, weight=1)
-
-# File name tracking
-filename_var = tk.StringVar()
-filename_var.set(datetime.datetime.now().strftime(DEFAULT_FILENAME))
-
-# Top bar with filename
-header_frame = tk.Frame(root)
-header_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
-
-file_label = tk.Label(header_frame, text="File:", font=("Courier New", 12))
-file_label.pack(side="left", padx=5)
-
-filename_label = tk.Label(header_frame, textvariable=filename_var, font=("Courier New", 12))
-filename_label.pack(side="left", fill="x", expand=True, padx=5)
-
-help_hint = tk.Label(header_frame, text="Ctrl+T for help", font=("Courier New", 10))
-help_hint.pack(side="right", padx=5)
-
-# Main text area
-text_frame = tk.Frame(root)
-text_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
-text_frame.grid_rowconfigure(0, weight=1)
-text_frame.grid_columnconfigure(0, weight=1)
-
-text_widget = tk.Text(text_frame, wrap="word", font=("Courier New", 12))
-text_widget.grid(row=0, column=0, sticky="nsew")
-
-scrollbar = tk.Scrollbar(text_frame, command=text_widget.yview)
-scrollbar.grid(row=0, column=1, sticky="ns")
-text_widget.config(yscrollcommand=scrollbar.set)
-
-# Help panel
-help_frame = tk.Frame(root)
-help_frame.grid(row=2, column=0, sticky="ew", padx=5, pady=5)
-help_label = tk.Label(help_frame, text=HELP_TEXT, font=("Courier New", 12), justify="left")
-help_label.pack(padx=10, pady=10)
-help_frame.grid_remove()  # Initially hidden
-
-# File browser (initially hidden)
-browser_frame = tk.Frame(root)
-file_listbox = tk.Listbox(browser_frame, font=("Courier New", 10))
-file_listbox.pack(side="left", fill="both", expand=True)
-
-browser_scrollbar = tk.Scrollbar(browser_frame, orient="vertical", command=file_listbox.yview)
-browser_scrollbar.pack(side="right", fill="y")
-file_listbox.config(yscrollcommand=browser_scrollbar.set)
-
-# Apply theme to all widgets
-root.tk_setPalette(background=THEME["window_bg"], foreground=THEME["text_fg"])
-apply_theme_to_widget(root)
-
-# KEY BINDINGS
-root.bind("<Control-s>", save_file)
-root.bind("<Control-n>", new_file)
-root.bind("<Control-f>", toggle_file_browser)
-root.bind("<Control-t>", toggle_help_panel)
-root.bind("<Control-m>", email_text)
-root.bind("<Control-q>", show_qr_code)
-file_listbox.bind("<Return>", load_selected_file)
-
-# Start the app with focus on text
-text_widget.focus_set()
 
 if __name__ == "__main__":
-    root.mainloop()
+    App().run()